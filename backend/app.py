@@ -3,24 +3,142 @@ Sports Evaluation System - Production Backend
 Deployment-ready Flask API for Vercel
 '''
 
-from flask import Flask, request, jsonify, send_from_directory, send_file
+from flask import Flask, Response, g, request, jsonify, send_from_directory, send_file
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
+import cProfile
+import gzip
+import hmac
 import json
 import os
-from datetime import datetime
+import pstats
+import random
+import sys
+import uuid
+import zlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from functools import wraps
 import sqlite3
-from typing import Dict, List, Any, Optional
+import numpy as np
+from typing import Callable, Dict, List, Any, Optional, Tuple
 from dotenv import load_dotenv  # For loading .env file
 
+try:
+    import orjson  # Optional fast JSON serializer
+except ImportError:
+    orjson = None
+
 # Load environment variables from .env file
 load_dotenv()
 
+
+class FastJSONProvider(DefaultJSONProvider):
+    """JSON provider that uses orjson when installed and stdlib json otherwise."""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return self.dumps_bytes(obj, **kwargs).decode('utf-8')
+
+    def dumps_bytes(self, obj: Any, **kwargs: Any) -> bytes:
+        """Serialize obj to UTF-8 encoded JSON."""
+        # orjson only covers compact or 2-space output; anything else goes to stdlib
+        if orjson is None or set(kwargs) - {'separators', 'indent'} or kwargs.get('indent') not in (None, 2):
+            return super().dumps(obj, **kwargs).encode('utf-8')
+        # Dates go through default() so they serialize exactly as with stdlib json
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option)
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            body = self.dumps_bytes(obj, indent=2)
+        else:
+            body = self.dumps_bytes(obj, separators=(",", ":"))
+        return self._app.response_class(body + b"\n", mimetype=self.mimetype)
+
+
 app = Flask(__name__, static_folder='../frontend', static_url_path='')
+app.json = FastJSONProvider(app)
 CORS(app, origins=["*"])  # Allow all origins for deployment
 
 # Database setup for production
 DATABASE_FILE = os.environ['DATABASE_PATH']
 
+# Admission control for expensive aggregate endpoints (sized for a small VM)
+HEAVY_MAX_CONCURRENCY = int(os.environ.get('HEAVY_MAX_CONCURRENCY', 2))
+HEAVY_QUEUE_TIMEOUT = float(os.environ.get('HEAVY_QUEUE_TIMEOUT', 1.0))
+HEAVY_RETRY_AFTER = int(os.environ.get('HEAVY_RETRY_AFTER', 2))
+
+# Response compression negotiated through Accept-Encoding
+COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', 1024))
+COMPRESS_LEVEL = int(os.environ.get('COMPRESS_LEVEL', 6))
+# Static files go through send_file (direct passthrough) and are never compressed here
+COMPRESS_MIMETYPES = {'application/json'}
+
+# On-demand request profiling (disabled unless PROFILING_ENABLED=1)
+PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED', '0') == '1'
+PROFILING_TOKEN = os.environ.get('PROFILING_TOKEN', '')
+PROFILING_SAMPLE_RATE = float(os.environ.get('PROFILING_SAMPLE_RATE', 0.0))
+PROFILING_PATHS = tuple(p for p in os.environ.get('PROFILING_PATHS', '/api/').split(',') if p)
+PROFILING_DIR = os.environ.get('PROFILING_DIR',
+                               os.path.join(os.path.dirname(os.path.abspath(__file__)), 'profiles'))
+PROFILING_INTERVAL = float(os.environ.get('PROFILING_INTERVAL', 0.001))
+PROFILING_MAX_FILES = int(os.environ.get('PROFILING_MAX_FILES', 50))
+
+# Default number of tests in the analytics rolling window
+ANALYTICS_WINDOW = int(os.environ.get('ANALYTICS_WINDOW', 5))
+ANALYTICS_MAX_WINDOW = int(os.environ.get('ANALYTICS_MAX_WINDOW', 365))
+ANALYTICS_CACHE_SIZE = int(os.environ.get('ANALYTICS_CACHE_SIZE', 4))
+
+# Precomputed score snapshot: refreshed at each day boundary and after writes
+PRECOMPUTE_ENABLED = os.environ.get('PRECOMPUTE_ENABLED', '1') == '1'
+PRECOMPUTE_DEBOUNCE = float(os.environ.get('PRECOMPUTE_DEBOUNCE', 2.0))
+EVOLUTION_TAIL = int(os.environ.get('EVOLUTION_TAIL', 20))
+PRECOMPUTE_MAX_BACKOFF = float(os.environ.get('PRECOMPUTE_MAX_BACKOFF', 3600))
+
+
+# Row shape recorded in the change log for each synced entity
+CHANGE_QUERIES = {
+    'config': ('SELECT global_lambda FROM config WHERE id = ?', ('global_lambda',)),
+    'team': ('SELECT id, name, created_at FROM teams WHERE id = ?', ('id', 'name', 'created_at')),
+    'discipline': ('SELECT id, name, created_at FROM disciplines WHERE id = ?',
+                   ('id', 'name', 'created_at')),
+    'test': ('''
+        SELECT id, team_id, discipline_id, score, test_date, lambda_value, created_at
+        FROM tests WHERE id = ?
+    ''', ('id', 'team_id', 'discipline_id', 'score', 'test_date', 'lambda_value', 'created_at')),
+}
+
+
+def record_change(cursor: sqlite3.Cursor, entity: str, entity_id: int) -> None:
+    """Append the row's current state, or a tombstone if it is gone, to the change log.
+
+    Must run in the same transaction as the write. Older entries for the same
+    row are dropped, since any client behind them also needs the new one.
+    """
+    query, columns = CHANGE_QUERIES[entity]
+    cursor.execute(query, (entity_id,))
+    row = cursor.fetchone()
+
+    cursor.execute('DELETE FROM changes WHERE entity = ? AND entity_id = ?', (entity, entity_id))
+    cursor.execute('INSERT INTO changes (entity, entity_id, op, data) VALUES (?, ?, ?, ?)', (
+        entity,
+        entity_id,
+        'upsert' if row else 'delete',
+        json.dumps(dict(zip(columns, row))) if row else None
+    ))
+
 
 def init_database():
     """Initialize SQLite database with required tables."""
@@ -72,6 +190,19 @@ def init_database():
         )
     ''')
     
+    # Change log for delta sync (AUTOINCREMENT keeps seq monotonic)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS changes (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            entity TEXT NOT NULL,
+            entity_id INTEGER NOT NULL,
+            op TEXT NOT NULL,
+            data TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_changes_entity ON changes (entity, entity_id)')
+    
     # Insert default configuration if not exists
     cursor.execute('SELECT COUNT(*) FROM config')
     if cursor.fetchone()[0] == 0:
@@ -88,12 +219,483 @@ def init_database():
             ('All Around')
         ''')
     
+    # Seed the change log with existing data the first time it is created
+    cursor.execute('SELECT COUNT(*) FROM changes')
+    if cursor.fetchone()[0] == 0:
+        for entity, query in (('config', 'SELECT id FROM config'),
+                              ('discipline', 'SELECT id FROM disciplines'),
+                              ('team', 'SELECT id FROM teams'),
+                              ('test', 'SELECT id FROM tests WHERE team_id IN (SELECT id FROM teams)')):
+            for (entity_id,) in cursor.execute(query).fetchall():
+                record_change(cursor, entity, entity_id)
+    
     conn.commit()
     conn.close()
 
 # Initialize database on startup
 init_database()
 
+
+class SingleFlight:
+    """Share one in-flight computation among concurrent identical calls."""
+
+    class _Call:
+        def __init__(self):
+            self.done = threading.Event()
+            self.result: Any = None
+            self.error: Optional[BaseException] = None
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, 'SingleFlight._Call'] = {}
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """Run fn for key, or wait for the call already running for it."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = SingleFlight._Call()
+
+        if not leader:
+            call.done.wait()
+        else:
+            try:
+                call.result = fn()
+            except BaseException as e:
+                call.error = e
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+
+_single_flight = SingleFlight()
+_heavy_slots = threading.BoundedSemaphore(HEAVY_MAX_CONCURRENCY)
+
+
+# Incremented by every write so derived results can be cached per version
+_data_version = 0
+_data_version_lock = threading.Lock()
+
+
+def bump_data_version() -> int:
+    """Mark stored data as changed and return the new version."""
+    global _data_version
+    with _data_version_lock:
+        _data_version += 1
+        version = _data_version
+    _score_cache.notify_write()
+    return version
+
+
+def get_data_version() -> int:
+    """Return the current data version."""
+    return _data_version
+
+
+# Small LRU of analytics results keyed by (data version, window)
+_analytics_cache: 'OrderedDict[Tuple[int, int], List[Dict[str, Any]]]' = OrderedDict()
+_analytics_cache_lock = threading.Lock()
+
+
+def get_cached_analytics(key: Tuple[int, int]) -> Optional[List[Dict[str, Any]]]:
+    """Return cached analytics for key, if any."""
+    with _analytics_cache_lock:
+        analytics = _analytics_cache.get(key)
+        if analytics is not None:
+            _analytics_cache.move_to_end(key)
+        return analytics
+
+
+def store_cached_analytics(key: Tuple[int, int], analytics: List[Dict[str, Any]]) -> None:
+    """Cache analytics for key, dropping other data versions and old windows."""
+    with _analytics_cache_lock:
+        for stale in [k for k in _analytics_cache if k[0] != key[0]]:
+            del _analytics_cache[stale]
+        _analytics_cache[key] = analytics
+        while len(_analytics_cache) > ANALYTICS_CACHE_SIZE:
+            _analytics_cache.popitem(last=False)
+
+
+# Headers recomputed for each coalesced response rather than shared
+PER_REQUEST_HEADERS = {'content-length', 'set-cookie'}
+
+
+def heavy_endpoint(view):
+    """Coalesce identical concurrent requests and shed load when saturated.
+
+    Only the leader of a coalesced group takes a concurrency slot; if none
+    frees up within HEAVY_QUEUE_TIMEOUT the whole group gets a 503.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        def compute() -> Tuple[bytes, int, List[Tuple[str, str]]]:
+            if _heavy_slots.acquire(timeout=HEAVY_QUEUE_TIMEOUT):
+                try:
+                    response = app.make_response(view(*args, **kwargs))
+                finally:
+                    _heavy_slots.release()
+            else:
+                response = jsonify({"error": "Server busy, retry later"})
+                response.status_code = 503
+                response.headers['Retry-After'] = str(HEAVY_RETRY_AFTER)
+            headers = [(name, value) for name, value in response.headers
+                       if name.lower() not in PER_REQUEST_HEADERS]
+            return response.get_data(), response.status_code, headers
+
+        key = request.full_path
+        body, status, headers = _single_flight.do(key, compute)
+        return Response(body, status=status, headers=headers)
+    return wrapper
+
+
+def parse_test_date(value: Any) -> Optional[datetime]:
+    """Parse a stored test date, or return None if it is not ISO formatted."""
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def calculate_weighted_score(tests: List[Dict[str, Any]], global_lambda: float,
+                             today: Optional[datetime] = None) -> float:
+    """Calculate weighted score with time-based exponential decay."""
+    if not tests:
+        return 0.0
+
+    today = today or datetime.now()
+    weighted_sum = 0.0
+    for test in tests:
+        test_date = parse_test_date(test['test_date'])
+        if test_date is None:
+            continue  # Skip malformed legacy rows instead of failing every read
+        lambda_val = test.get('lambda_value') or global_lambda
+        days_diff = (today - test_date).days
+
+        # Weekly decay factor (same as frontend)
+        weighted_sum += (lambda_val ** (days_diff / 7)) * test['score']
+
+    return (1 - global_lambda) * weighted_sum
+
+
+def calculate_evolution_tail(tests: List[Dict[str, Any]], global_lambda: float,
+                             tail: int) -> List[Dict[str, Any]]:
+    """Weighted score after each of the last `tail` tests (same formula as the chart)."""
+    points = []
+    for i in range(max(len(tests) - tail, 0), len(tests)):
+        weighted_sum = sum(((test.get('lambda_value') or global_lambda) ** (i - j)) * test['score']
+                           for j, test in enumerate(tests[:i + 1]))
+        points.append({
+            "test_date": tests[i]['test_date'],
+            "weighted_score": (1 - global_lambda) * weighted_sum
+        })
+    return points
+
+
+def rank_teams(teams: List[Dict[str, Any]], global_lambda: float,
+               today: datetime) -> List[Dict[str, Any]]:
+    """Score teams on their tests and sort them into ranked positions."""
+    rankings = [{
+        "id": team["id"],
+        "name": team["name"],
+        "weighted_score": calculate_weighted_score(team["tests"], global_lambda, today),
+        "test_count": len(team["tests"])
+    } for team in teams]
+    rankings.sort(key=lambda x: x["weighted_score"], reverse=True)
+
+    for i, team in enumerate(rankings):
+        team["position"] = i + 1
+    return rankings
+
+
+def parse_test_days(dates: List[Any]) -> np.ndarray:
+    """Convert test dates to datetime64[D], with NaT for malformed ones."""
+    try:
+        days = np.array(dates, dtype='datetime64[D]')
+        # numpy reads compact forms like '20260315' as a year; treat those as malformed
+        if not ((days >= np.datetime64('0001-01-01')) & (days <= np.datetime64('9999-12-31'))
+                | np.isnat(days)).all():
+            raise ValueError('date out of range')
+        return days
+    except ValueError:
+        # At least one malformed date: parse each one so only that row is dropped
+        parsed = [parse_test_date(value) for value in dates]
+        return np.array([test_date.date() if test_date else None for test_date in parsed],
+                        dtype='datetime64[D]')
+
+
+def compute_analytics(rows: List[Tuple], league_teams: Dict[int, str],
+                      disciplines: Dict[int, str], window: int) -> List[Dict[str, Any]]:
+    """Compute per team and discipline trend statistics as array operations.
+
+    rows are (team_id, discipline_id, score, test_date) sorted by team,
+    discipline and date. Percentiles compare each team's latest rolling
+    mean against the other teams in the same discipline.
+    """
+    if not rows:
+        return []
+
+    # Rows with malformed dates (NaT) are left out rather than failing the whole league
+    all_days = parse_test_days([row[3] for row in rows])
+    valid = ~np.isnat(all_days)
+    if not valid.any():
+        return []
+
+    team = np.array([row[0] for row in rows], dtype=np.int64)[valid]
+    disc = np.array([row[1] for row in rows], dtype=np.int64)[valid]
+    score = np.array([row[2] for row in rows], dtype=np.float64)[valid]
+    dates = [row[3] for row, ok in zip(rows, valid) if ok]
+    day = all_days[valid].astype(np.int64).astype(np.float64)
+    n = len(dates)
+
+    # Group boundaries: a new group starts wherever (team, discipline) changes
+    is_start = np.ones(n, dtype=bool)
+    is_start[1:] = (team[1:] != team[:-1]) | (disc[1:] != disc[:-1])
+    starts = np.flatnonzero(is_start)
+    ends = np.append(starts[1:], n)
+    counts = ends - starts
+    group_of = np.repeat(np.arange(len(starts)), counts)
+
+    # Rolling mean/variance from prefix sums, clipped at the group start
+    idx = np.arange(n)
+    lo = np.maximum(idx - window + 1, starts[group_of])
+    size = idx - lo + 1
+    cs = np.concatenate(([0.0], np.cumsum(score)))
+    cs2 = np.concatenate(([0.0], np.cumsum(score * score)))
+    rolling_mean = (cs[idx + 1] - cs[lo]) / size
+    rolling_var = np.maximum((cs2[idx + 1] - cs2[lo]) / size - rolling_mean ** 2, 0.0)
+
+    # Least-squares slope in points per week, x relative to the first test
+    x = (day - day[starts][group_of]) / 7
+    sx = np.add.reduceat(x, starts)
+    sy = np.add.reduceat(score, starts)
+    sxy = np.add.reduceat(x * score, starts)
+    sxx = np.add.reduceat(x * x, starts)
+    denom = counts * sxx - sx * sx
+    safe = np.where(denom > 0, denom, 1.0)
+    slope = np.where(denom > 0, (counts * sxy - sx * sy) / safe, 0.0)
+
+    # Personal best and the first date it was reached
+    best = np.maximum.reduceat(score, starts)
+    best_idx = np.minimum.reduceat(np.where(score == best[group_of], idx, n), starts)
+
+    # Percentile of the latest rolling mean within each discipline
+    latest = rolling_mean[ends - 1]
+    group_disc = disc[starts]
+    percentile = np.zeros(len(starts))
+    for discipline_id in np.unique(group_disc):
+        members = group_disc == discipline_id
+        league = np.sort(latest[members])
+        percentile[members] = (np.searchsorted(league, latest[members], side='right')
+                               / len(league) * 100)
+
+    analytics = []
+    for group, (start, end) in enumerate(zip(starts, ends)):
+        analytics.append({
+            "team_id": int(team[start]),
+            "team_name": league_teams.get(int(team[start])),
+            "discipline_id": int(group_disc[group]),
+            "discipline_name": disciplines.get(int(group_disc[group])),
+            "test_count": int(counts[group]),
+            "dates": dates[start:end],
+            "rolling_mean": rolling_mean[start:end].round(4).tolist(),
+            "rolling_variance": rolling_var[start:end].round(4).tolist(),
+            "trend_slope": round(float(slope[group]), 4),
+            "personal_best": {
+                "score": float(best[group]),
+                "test_date": dates[best_idx[group]]
+            },
+            "percentile": round(float(percentile[group]), 2)
+        })
+    return analytics
+
+
+def get_global_lambda(cursor: sqlite3.Cursor) -> float:
+    """Read the current global lambda value."""
+    cursor.execute('SELECT global_lambda FROM config ORDER BY id DESC LIMIT 1')
+    result = cursor.fetchone()
+    return result[0] if result else 0.95
+
+
+def build_score_snapshot(today: datetime) -> Dict[str, Any]:
+    """Compute rankings, per-discipline rankings and evolution tails for one day."""
+    conn = sqlite3.connect(DATABASE_FILE)
+    cursor = conn.cursor()
+    global_lambda = get_global_lambda(cursor)
+    teams = load_teams_with_tests(cursor)
+    cursor.execute('SELECT id, name FROM disciplines ORDER BY name')
+    disciplines = cursor.fetchall()
+    conn.close()
+
+    discipline_rankings = []
+    for discipline_id, discipline_name in disciplines:
+        discipline_teams = [
+            dict(team, tests=[t for t in team["tests"] if t["discipline_id"] == discipline_id])
+            for team in teams
+        ]
+        discipline_rankings.append({
+            "discipline_id": discipline_id,
+            "discipline_name": discipline_name,
+            "rankings": rank_teams(discipline_teams, global_lambda, today)
+        })
+
+    return {
+        "rankings": rank_teams(teams, global_lambda, today),
+        "discipline_rankings": discipline_rankings,
+        "evolution": {team["id"]: calculate_evolution_tail(team["tests"], global_lambda, EVOLUTION_TAIL)
+                      for team in teams}
+    }
+
+
+class ScoreCache:
+    """Day-scoped snapshot of decayed scores, kept warm by a background thread.
+
+    Decayed scores only change when the day changes or data is written, so the
+    worker refreshes the snapshot at each midnight and once writes settle for
+    PRECOMPUTE_DEBOUNCE seconds. Requests that find the snapshot stale (wrong
+    day or data version) rebuild it synchronously, so they never see old data.
+    Failed background rebuilds are retried with exponential backoff capped at
+    PRECOMPUTE_MAX_BACKOFF seconds.
+    """
+
+    def __init__(self, debounce: float):
+        self._debounce = debounce
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._pending_at: Optional[float] = None
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._thread: Optional[threading.Thread] = None
+        self._failures = 0
+        self._retry_at: Optional[float] = None
+
+    def start(self):
+        """Start the background refresh thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='score-cache', daemon=True)
+            self._thread.start()
+
+    def notify_write(self):
+        """Schedule a debounced refresh after a write."""
+        with self._lock:
+            self._pending_at = time.monotonic() + self._debounce
+        self._wake.set()
+
+    def get(self) -> Dict[str, Any]:
+        """Return a snapshot valid for today and the current data version."""
+        snapshot = self._snapshot
+        if not self._is_fresh(snapshot):
+            snapshot = _single_flight.do('score-cache', self.refresh)
+        return snapshot
+
+    def refresh(self) -> Dict[str, Any]:
+        """Rebuild the snapshot now."""
+        # Read the version first so a write racing the rebuild leaves it stale
+        version = get_data_version()
+        today = datetime.now()
+        snapshot = build_score_snapshot(today)
+        snapshot.update(day=today.date(), data_version=version, computed_at=time.time())
+        self._snapshot = snapshot
+        with self._lock:
+            self._failures = 0
+            self._retry_at = None
+        return snapshot
+
+    def status(self) -> Dict[str, Any]:
+        """Describe the cached snapshot for the health check."""
+        snapshot = self._snapshot
+        if snapshot is None:
+            return {"warm": False, "age_seconds": None, "data_version": None}
+        return {
+            "warm": self._is_fresh(snapshot),
+            "age_seconds": round(time.time() - snapshot["computed_at"], 3),
+            "data_version": snapshot["data_version"]
+        }
+
+    def _is_fresh(self, snapshot: Optional[Dict[str, Any]]) -> bool:
+        return (snapshot is not None
+                and snapshot["day"] == datetime.now().date()
+                and snapshot["data_version"] == get_data_version())
+
+    def _seconds_until_due(self) -> float:
+        with self._lock:
+            pending_at, retry_at = self._pending_at, self._retry_at
+        if self._snapshot is None and retry_at is None:
+            return 0.0
+        now = datetime.now()
+        next_day = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+        wait = (next_day - now).total_seconds()
+        for deadline in (pending_at, retry_at):
+            if deadline is not None:
+                wait = min(wait, deadline - time.monotonic())
+        return max(wait, 0.0)
+
+    def _schedule_retry(self):
+        with self._lock:
+            self._failures += 1
+            # Cap the exponent: the delay is clamped anyway and 2 ** n overflows floats
+            backoff = max(self._debounce, 1.0) * 2 ** min(self._failures - 1, 32)
+            self._retry_at = time.monotonic() + min(backoff, PRECOMPUTE_MAX_BACKOFF)
+
+    def _run(self):
+        while True:
+            self._wake.wait(self._seconds_until_due())
+            self._wake.clear()
+            self._step()
+
+    def _step(self):
+        """Run one scheduling round after the worker wakes up."""
+        with self._lock:
+            if self._pending_at is not None and self._pending_at > time.monotonic():
+                return  # Writes still arriving, keep debouncing
+            self._pending_at = None
+
+        if self._is_fresh(self._snapshot):
+            # A request may have rebuilt the snapshot after our last failure
+            with self._lock:
+                self._failures = 0
+                self._retry_at = None
+            return
+
+        try:
+            _single_flight.do('score-cache', self.refresh)
+        except Exception:
+            app.logger.exception('Score cache refresh failed')
+            self._schedule_retry()
+
+
+_score_cache = ScoreCache(PRECOMPUTE_DEBOUNCE)
+
+
+def load_teams_with_tests(cursor: sqlite3.Cursor) -> List[Dict[str, Any]]:
+    """Load every team with its tests in two queries."""
+    cursor.execute('SELECT id, name, created_at FROM teams ORDER BY name')
+    teams = [{"id": row[0], "name": row[1], "created_at": row[2], "tests": []}
+             for row in cursor.fetchall()]
+    by_id = {team["id"]: team for team in teams}
+
+    cursor.execute('''
+        SELECT id, team_id, discipline_id, score, test_date, lambda_value, created_at
+        FROM tests
+        ORDER BY test_date ASC
+    ''')
+    for row in cursor.fetchall():
+        team = by_id.get(row[1])
+        if team is not None:
+            team["tests"].append({
+                "id": row[0],
+                "discipline_id": row[2],
+                "score": row[3],
+                "test_date": row[4],
+                "lambda_value": row[5],
+                "created_at": row[6]
+            })
+    return teams
+
 @app.route('/api/config', methods=['GET'])
 def get_config():
     """Get global configuration."""
@@ -125,7 +727,9 @@ def update_config():
             INSERT OR REPLACE INTO config (id, global_lambda, updated_at) 
             VALUES (1, ?, CURRENT_TIMESTAMP)
         ''', (global_lambda,))
+        record_change(cursor, 'config', 1)
         conn.commit()
+        bump_data_version()
         conn.close()
         
         return jsonify({"message": "Configuration updated", "global_lambda": global_lambda})
@@ -151,6 +755,88 @@ def get_teams():
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@app.route('/api/teams-with-tests', methods=['GET'])
+@heavy_endpoint
+def get_teams_with_tests():
+    """Get all teams with their full test history."""
+    try:
+        conn = sqlite3.connect(DATABASE_FILE)
+        cursor = conn.cursor()
+        teams = load_teams_with_tests(cursor)
+        conn.close()
+        return jsonify(teams)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/rankings', methods=['GET'])
+@heavy_endpoint
+def get_rankings():
+    """Get current rankings with weighted scores."""
+    try:
+        return jsonify(_score_cache.get()["rankings"])
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/rankings/disciplines', methods=['GET'])
+@heavy_endpoint
+def get_discipline_rankings():
+    """Get rankings with weighted scores for each discipline."""
+    try:
+        return jsonify(_score_cache.get()["discipline_rankings"])
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/teams/<int:team_id>/evolution', methods=['GET'])
+@heavy_endpoint
+def get_team_evolution(team_id: int):
+    """Get the weighted score after each of the team's most recent tests."""
+    try:
+        evolution = _score_cache.get()["evolution"].get(team_id)
+        if evolution is None:
+            return jsonify({"error": "Team not found"}), 404
+        return jsonify(evolution)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/analytics', methods=['GET'])
+@heavy_endpoint
+def get_analytics():
+    """Get rolling statistics, trend, personal bests and percentiles per team and discipline."""
+    try:
+        window = request.args.get('window', ANALYTICS_WINDOW, type=int)
+        if not 1 <= window <= ANALYTICS_MAX_WINDOW:
+            return jsonify({"error": f"Window must be between 1 and {ANALYTICS_MAX_WINDOW}"}), 400
+
+        version = get_data_version()
+        cache_key = (version, window)
+        cached = get_cached_analytics(cache_key)
+        if cached is None:
+            conn = sqlite3.connect(DATABASE_FILE)
+            cursor = conn.cursor()
+            cursor.execute('SELECT id, name FROM teams')
+            teams = dict(cursor.fetchall())
+            cursor.execute('SELECT id, name FROM disciplines')
+            disciplines = dict(cursor.fetchall())
+            cursor.execute('''
+                SELECT ts.team_id, ts.discipline_id, ts.score, ts.test_date
+                FROM tests ts
+                JOIN teams t ON t.id = ts.team_id
+                ORDER BY ts.team_id, ts.discipline_id, ts.test_date
+            ''')
+            rows = cursor.fetchall()
+            conn.close()
+
+            cached = compute_analytics(rows, teams, disciplines, window)
+            store_cached_analytics(cache_key, cached)
+
+        return jsonify({
+            "data_version": version,
+            "window": window,
+            "analytics": cached
+        })
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
 @app.route('/api/teams', methods=['POST'])
 def create_team():
     """Create a new team."""
@@ -166,7 +852,9 @@ def create_team():
         try:
             cursor.execute('INSERT INTO teams (name) VALUES (?)', (name,))
             team_id = cursor.lastrowid
+            record_change(cursor, 'team', team_id)
             conn.commit()
+            bump_data_version()
             
             return jsonify({
                 "id": team_id,
@@ -194,9 +882,17 @@ def delete_team(team_id: int):
             conn.close()
             return jsonify({"error": "Team not found"}), 404
         
-        # Delete team (CASCADE will delete tests)
+        # Foreign keys are not enforced, so delete the team's tests explicitly
+        cursor.execute('SELECT id FROM tests WHERE team_id = ?', (team_id,))
+        test_ids = [row[0] for row in cursor.fetchall()]
+        cursor.execute('DELETE FROM tests WHERE team_id = ?', (team_id,))
+        for test_id in test_ids:
+            record_change(cursor, 'test', test_id)
+
         cursor.execute('DELETE FROM teams WHERE id = ?', (team_id,))
+        record_change(cursor, 'team', team_id)
         conn.commit()
+        bump_data_version()
         conn.close()
         
         return jsonify({"message": f"Team '{team[0]}' deleted successfully"})
@@ -256,6 +952,11 @@ def create_test():
         if not team_id or not discipline_id or score < 0 or not test_date:
             return jsonify({"error": "Invalid test data"}), 400
         
+        try:
+            test_date = date.fromisoformat(test_date).isoformat()
+        except (TypeError, ValueError):
+            return jsonify({"error": "test_date must be an ISO date (YYYY-MM-DD)"}), 400
+        
         # Get current lambda value
         conn = sqlite3.connect(DATABASE_FILE)
         cursor = conn.cursor()
@@ -275,9 +976,7 @@ def create_test():
             return jsonify({"error": "Discipline not found"}), 404
         
         # Get current lambda value
-        cursor.execute('SELECT global_lambda FROM config ORDER BY id DESC LIMIT 1')
-        lambda_result = cursor.fetchone()
-        lambda_value = lambda_result[0] if lambda_result else 0.95
+        lambda_value = get_global_lambda(cursor)
         
         # Insert test
         cursor.execute('''
@@ -286,7 +985,9 @@ def create_test():
         ''', (team_id, discipline_id, score, test_date, lambda_value))
         
         test_id = cursor.lastrowid
+        record_change(cursor, 'test', test_id)
         conn.commit()
+        bump_data_version()
         conn.close()
         
         return jsonify({
@@ -335,7 +1036,9 @@ def create_discipline():
         try:
             cursor.execute('INSERT INTO disciplines (name) VALUES (?)', (name,))
             discipline_id = cursor.lastrowid
+            record_change(cursor, 'discipline', discipline_id)
             conn.commit()
+            bump_data_version()
             
             return jsonify({
                 "id": discipline_id,
@@ -372,7 +1075,9 @@ def update_discipline(discipline_id: int):
         # Update discipline
         cursor.execute('UPDATE disciplines SET name = ? WHERE id = ?',
                      (name, discipline_id))
+        record_change(cursor, 'discipline', discipline_id)
         conn.commit()
+        bump_data_version()
         conn.close()
         
         return jsonify({
@@ -406,10 +1111,14 @@ def delete_discipline(discipline_id: int):
         
         # Delete discipline
         cursor.execute('DELETE FROM disciplines WHERE id = ?', (discipline_id,))
+        deleted = cursor.rowcount
+        if deleted:
+            record_change(cursor, 'discipline', discipline_id)
         conn.commit()
+        bump_data_version()
         
         # Verify if discipline was actually deleted
-        if cursor.rowcount == 0:
+        if deleted == 0:
             conn.close()
             return jsonify({"error": "Discipline could not be deleted"}), 500
             
@@ -437,15 +1146,269 @@ def get_discipline_test_count(discipline_id: int):
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@app.route('/api/changes', methods=['GET'])
+@heavy_endpoint
+def get_changes():
+    """Get changes after a sequence number for delta sync.
+
+    `reset` is true when the client's sequence is unknown to this database,
+    in which case it must discard its cache and sync again from 0.
+    """
+    try:
+        since = request.args.get('since', 0, type=int)
+        if since < 0:
+            return jsonify({"error": "since must be a non-negative integer"}), 400
+
+        conn = sqlite3.connect(DATABASE_FILE)
+        cursor = conn.cursor()
+        cursor.execute("SELECT COALESCE(MAX(seq), 0) FROM changes")
+        latest = cursor.fetchone()[0]
+        if since > latest:
+            conn.close()
+            return jsonify({"seq": latest, "reset": True, "changes": []})
+
+        cursor.execute('''
+            SELECT seq, entity, entity_id, op, data
+            FROM changes
+            WHERE seq > ?
+            ORDER BY seq ASC
+        ''', (since,))
+        changes = [{
+            "seq": row[0],
+            "entity": row[1],
+            "entity_id": row[2],
+            "op": row[3],
+            "data": json.loads(row[4]) if row[4] else None
+        } for row in cursor.fetchall()]
+        conn.close()
+
+        # A write may land between the two queries; never report a seq below what was sent
+        latest = max([latest] + [change["seq"] for change in changes])
+        return jsonify({"seq": latest, "reset": False, "changes": changes})
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint."""
     return jsonify({
         "status": "healthy",
         "timestamp": datetime.now().isoformat(),
-        "version": "1.0.0"
+        "version": "1.0.0",
+        "score_cache": _score_cache.status()
     })
 
+def compress_body(data: bytes, encoding: str) -> bytes:
+    """Encode data with gzip or deflate (zlib stream, as HTTP expects)."""
+    if encoding == 'gzip':
+        return gzip.compress(data, compresslevel=COMPRESS_LEVEL)
+    return zlib.compress(data, COMPRESS_LEVEL)
+
+@app.after_request
+def compress_response(response):
+    """Compress large responses when the client accepts gzip or deflate."""
+    if (response.direct_passthrough
+            or response.status_code < 200 or response.status_code in (204, 304)
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESS_MIMETYPES):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    encoding = request.accept_encodings.best_match(['gzip', 'deflate'])
+    data = response.get_data()
+    if encoding is None or len(data) < COMPRESS_MIN_SIZE:
+        return response
+
+    response.set_data(compress_body(data, encoding))
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+class StackSampler:
+    """Sample one thread's Python stack at a fixed interval as collapsed stacks."""
+
+    def __init__(self, thread_id: int, interval: float):
+        self._thread_id = thread_id
+        self._interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+        self.stacks: Dict[str, int] = {}
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self._interval):
+            frame = sys._current_frames().get(self._thread_id)
+            frames = []
+            while frame is not None:
+                code = frame.f_code
+                frames.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if frames:
+                stack = ';'.join(reversed(frames))
+                self.stacks[stack] = self.stacks.get(stack, 0) + 1
+
+
+# Functions whose inclusive time is attributed to each phase; nested matches count once
+PROFILE_PHASES: Dict[str, Callable[[Tuple[str, int, str]], bool]] = {
+    'sql': lambda key: key[0] == '~' and 'sqlite3' in key[2],
+    'scoring': lambda key: key[0] == __file__ and key[2] in (
+        'calculate_weighted_score', 'calculate_evolution_tail', 'rank_teams', 'compute_analytics'),
+    'serialization': lambda key: key[0] == __file__ and key[2] in (
+        'response', 'dumps', 'dumps_bytes', 'compress_response'),
+}
+
+# Only one request is profiled at a time; others run unprofiled
+_profiling_lock = threading.Lock()
+
+
+def summarize_phases(stats: pstats.Stats) -> Dict[str, float]:
+    """Split profiled time into SQL, scoring and serialization milliseconds."""
+    phases = {}
+    for phase, matches in PROFILE_PHASES.items():
+        total = 0.0
+        for key, (_, _, _, cumtime, callers) in stats.stats.items():
+            if matches(key) and not any(matches(caller) for caller in callers):
+                total += cumtime
+        phases[phase] = round(total * 1000, 3)
+    return phases
+
+
+def has_profiling_token() -> bool:
+    """Check X-Profile-Token against PROFILING_TOKEN in constant time."""
+    token = request.headers.get('X-Profile-Token', '')
+    return bool(PROFILING_TOKEN) and hmac.compare_digest(token.encode('utf-8'), PROFILING_TOKEN.encode('utf-8'))
+
+
+def should_profile() -> bool:
+    """Decide whether to profile the current request."""
+    if request.path.startswith('/api/debug/') or not request.path.startswith(PROFILING_PATHS):
+        return False
+    if has_profiling_token():
+        return True
+    return random.random() < PROFILING_SAMPLE_RATE
+
+
+def start_profiling():
+    """Start profiling the request if it was selected."""
+    if not should_profile() or not _profiling_lock.acquire(blocking=False):
+        return
+    g.profile_started = time.perf_counter()
+    g.profile_started_at = datetime.now()
+    g.profile_sampler = StackSampler(threading.get_ident(), PROFILING_INTERVAL)
+    g.profile_sampler.start()
+    g.profiler = cProfile.Profile()
+    g.profiler.enable()
+
+
+def capture_profile_status(response):
+    """Remember the status code for the profile summary."""
+    if 'profiler' in g:
+        g.profile_status = response.status_code
+    return response
+
+
+def finish_profiling(error=None):
+    """Stop profiling and write pstats, collapsed stacks and a summary."""
+    profiler = g.pop('profiler', None)
+    if profiler is None:
+        return
+    try:
+        profiler.disable()
+        g.profile_sampler.stop()
+        duration = time.perf_counter() - g.profile_started
+
+        os.makedirs(PROFILING_DIR, exist_ok=True)
+        slug = request.path.strip('/').replace('/', '_') or 'root'
+        profile_id = f"{datetime.now().strftime('%Y%m%dT%H%M%S%f')}_{request.method}_{slug}_{uuid.uuid4().hex[:6]}"
+        base = os.path.join(PROFILING_DIR, profile_id)
+
+        stats = pstats.Stats(profiler)
+        stats.dump_stats(base + '.pstats')
+        with open(base + '.collapsed', 'w') as f:
+            for stack, count in g.profile_sampler.stacks.items():
+                f.write(f"{stack} {count}\n")
+
+        phases = summarize_phases(stats)
+        phases['other'] = round(max(duration * 1000 - sum(phases.values()), 0.0), 3)
+        with open(base + '.json', 'w') as f:
+            json.dump({
+                "id": profile_id,
+                "method": request.method,
+                "path": request.full_path.rstrip('?'),
+                "status": g.get('profile_status', 500 if error else None),
+                "started_at": g.profile_started_at.isoformat(),
+                "duration_ms": round(duration * 1000, 3),
+                "phases_ms": phases,
+                "files": [profile_id + '.pstats', profile_id + '.collapsed']
+            }, f)
+
+        prune_profiles()
+    except Exception:
+        app.logger.exception('Writing request profile failed')
+    finally:
+        _profiling_lock.release()
+
+
+def prune_profiles():
+    """Keep only the newest PROFILING_MAX_FILES profiles."""
+    summaries = sorted(f for f in os.listdir(PROFILING_DIR) if f.endswith('.json'))
+    for summary in summaries[:max(len(summaries) - PROFILING_MAX_FILES, 0)]:
+        profile_id = summary[:-len('.json')]
+        for extension in ('.json', '.pstats', '.collapsed'):
+            try:
+                os.remove(os.path.join(PROFILING_DIR, profile_id + extension))
+            except FileNotFoundError:
+                pass
+
+
+def check_profiling_access():
+    """Return an error response unless profiling is enabled and the caller has the token.
+
+    Without PROFILING_TOKEN (sampling-only setups) the debug endpoints stay hidden.
+    """
+    if not PROFILING_ENABLED or not PROFILING_TOKEN:
+        return jsonify({"error": "Endpoint not found"}), 404
+    if not has_profiling_token():
+        return jsonify({"error": "Invalid profiling token"}), 403
+    return None
+
+
+if PROFILING_ENABLED:
+    # Teardown runs after every after_request hook, so compression is included
+    app.before_request(start_profiling)
+    app.after_request(capture_profile_status)
+    app.teardown_request(finish_profiling)
+
+@app.route('/api/debug/profiles', methods=['GET'])
+def list_profiles():
+    """List recorded request profiles, newest first."""
+    denied = check_profiling_access()
+    if denied:
+        return denied
+    try:
+        profiles = []
+        if os.path.isdir(PROFILING_DIR):
+            for name in sorted(os.listdir(PROFILING_DIR), reverse=True):
+                if name.endswith('.json'):
+                    with open(os.path.join(PROFILING_DIR, name)) as f:
+                        profiles.append(json.load(f))
+        return jsonify(profiles)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/debug/profiles/<path:filename>', methods=['GET'])
+def download_profile(filename):
+    """Download a pstats or collapsed-stack profile file."""
+    denied = check_profiling_access()
+    if denied:
+        return denied
+    return send_from_directory(PROFILING_DIR, filename, as_attachment=True)
+
 @app.route('/')
 def serve_frontend():
     """Serve the main frontend page."""
@@ -472,6 +1435,9 @@ def not_found(error):
 def internal_error(error):
     return jsonify({"error": "Internal server error"}), 500
 
+if PRECOMPUTE_ENABLED:
+    _score_cache.start()
+
 # For Vercel deployment
 def handler(request):
     return app(request.environ, lambda status, headers: None)
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark JSON serialization and bytes on the wire for large team lists.
+
+Compares the stdlib encoder with the fast provider used by app.py and
+reports the compressed size for each negotiated encoding.
+
+Usage: python benchmark_json.py [teams] [tests_per_team]
+"""
+
+import os
+import sys
+import tempfile
+import timeit
+from datetime import date, timedelta
+from typing import Any, Dict, List
+
+# app.py needs a database path; benchmark against a throwaway one
+os.environ.setdefault('DATABASE_PATH', os.path.join(tempfile.mkdtemp(), 'benchmark.db'))
+os.environ.setdefault('PRECOMPUTE_ENABLED', '0')
+
+from flask.json.provider import DefaultJSONProvider
+
+from app import app, compress_body, orjson
+
+
+def build_teams(team_count: int, tests_per_team: int) -> List[Dict[str, Any]]:
+    """Build a payload shaped like /api/teams-with-tests."""
+    start = date(2024, 1, 1)
+    return [{
+        "id": team_id,
+        "name": f"Equipo {team_id}",
+        "created_at": "2024-01-01 00:00:00",
+        "tests": [{
+            "id": team_id * tests_per_team + i,
+            "discipline_id": i % 4 + 1,
+            "score": round(5 + (team_id * 31 + i * 17) % 500 / 100, 2),
+            "test_date": (start + timedelta(days=i * 3)).isoformat(),
+            "lambda_value": 0.95,
+            "created_at": "2024-01-01 00:00:00"
+        } for i in range(tests_per_team)]
+    } for team_id in range(1, team_count + 1)]
+
+
+def main():
+    team_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    tests_per_team = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    teams = build_teams(team_count, tests_per_team)
+    print(f"📊 {team_count} teams x {tests_per_team} tests")
+    print(f"⚡ orjson available: {orjson is not None}")
+
+    providers = {
+        "stdlib": DefaultJSONProvider(app),
+        "fast": app.json,
+    }
+    for name, provider in providers.items():
+        with app.app_context():
+            runs = 5
+            seconds = timeit.timeit(lambda: provider.response(teams), number=runs) / runs
+            body = provider.response(teams).get_data()
+        print(f"\n{name}: {seconds * 1000:.1f} ms per response, {len(body):,} bytes")
+        for encoding in ('gzip', 'deflate'):
+            seconds = timeit.timeit(lambda: compress_body(body, encoding), number=3) / 3
+            size = len(compress_body(body, encoding))
+            print(f"  {encoding}: {size:,} bytes ({size / len(body):.1%}) in {seconds * 1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
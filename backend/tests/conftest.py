@@ -0,0 +1,12 @@
+"""
+Shared pytest setup for the backend: app.py reads its configuration at import time
+"""
+
+import os
+import sys
+import tempfile
+
+os.environ.setdefault('DATABASE_PATH', os.path.join(tempfile.mkdtemp(), 'sports_evaluation.db'))
+os.environ['PRECOMPUTE_ENABLED'] = '0'
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
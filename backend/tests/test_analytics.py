@@ -0,0 +1,88 @@
+"""
+Tests for the vectorized per team and discipline analytics
+"""
+
+import pytest
+
+import app as backend
+
+TEAMS = {1: 'Equipo A', 2: 'Equipo B', 3: 'Equipo C'}
+DISCIPLINES = {1: 'Maza', 2: 'Aro'}
+
+
+def by_group(analytics):
+    return {(entry['team_id'], entry['discipline_id']): entry for entry in analytics}
+
+
+def test_groups_split_on_team_and_discipline():
+    rows = [
+        (1, 1, 4.0, '2026-01-01'),
+        (1, 1, 6.0, '2026-01-08'),
+        (1, 2, 7.0, '2026-01-01'),
+        (2, 1, 5.0, '2026-01-01'),
+        (2, 1, 3.0, '2026-01-15'),
+    ]
+    groups = by_group(backend.compute_analytics(rows, TEAMS, DISCIPLINES, window=5))
+
+    assert sorted(groups) == [(1, 1), (1, 2), (2, 1)]
+    assert groups[(1, 1)]['dates'] == ['2026-01-01', '2026-01-08']
+    assert groups[(1, 2)]['test_count'] == 1
+    assert groups[(2, 1)]['team_name'] == 'Equipo B'
+    assert groups[(2, 1)]['discipline_name'] == 'Maza'
+    # Rolling windows never reach back into the previous group
+    assert groups[(2, 1)]['rolling_mean'] == [5.0, 4.0]
+
+
+def test_rolling_mean_and_variance():
+    rows = [(1, 1, 4.0, '2026-01-01'), (1, 1, 6.0, '2026-01-08'), (1, 1, 10.0, '2026-01-15')]
+    entry = backend.compute_analytics(rows, TEAMS, DISCIPLINES, window=2)[0]
+
+    assert entry['rolling_mean'] == [4.0, 5.0, 8.0]
+    assert entry['rolling_variance'] == [0.0, 1.0, 4.0]
+
+
+def test_trend_slope_in_points_per_week():
+    single = backend.compute_analytics([(1, 1, 8.0, '2026-01-01')], TEAMS, DISCIPLINES, window=5)
+    assert single[0]['trend_slope'] == 0.0
+
+    rows = [(1, 1, 5.0, '2026-01-01'), (1, 1, 7.0, '2026-01-08'), (1, 1, 9.0, '2026-01-15')]
+    entry = backend.compute_analytics(rows, TEAMS, DISCIPLINES, window=5)[0]
+    assert entry['trend_slope'] == pytest.approx(2.0)
+
+
+def test_personal_best_keeps_first_date_on_ties():
+    rows = [(1, 1, 9.0, '2026-01-01'), (1, 1, 5.0, '2026-01-08'), (1, 1, 9.0, '2026-01-15')]
+    entry = backend.compute_analytics(rows, TEAMS, DISCIPLINES, window=5)[0]
+
+    assert entry['personal_best'] == {"score": 9.0, "test_date": '2026-01-01'}
+
+
+def test_percentile_ties_share_the_top_rank():
+    rows = [
+        (1, 1, 8.0, '2026-01-01'),
+        (2, 1, 8.0, '2026-01-01'),
+        (3, 1, 2.0, '2026-01-01'),
+        (3, 2, 1.0, '2026-01-01'),
+    ]
+    groups = by_group(backend.compute_analytics(rows, TEAMS, DISCIPLINES, window=5))
+
+    assert groups[(1, 1)]['percentile'] == 100.0
+    assert groups[(2, 1)]['percentile'] == 100.0
+    assert groups[(3, 1)]['percentile'] == pytest.approx(33.33)
+    # Alone in its discipline
+    assert groups[(3, 2)]['percentile'] == 100.0
+
+
+def test_malformed_dates_are_skipped():
+    rows = [(1, 1, 4.0, '15/03/2026'), (1, 1, 6.0, '2026-01-08')]
+    analytics = backend.compute_analytics(rows, TEAMS, DISCIPLINES, window=5)
+
+    assert len(analytics) == 1
+    assert analytics[0]['dates'] == ['2026-01-08']
+    assert backend.compute_analytics([(1, 1, 4.0, 'bad')], TEAMS, DISCIPLINES, window=5) == []
+
+
+def test_date_parsing_matches_weighted_scores():
+    days = backend.parse_test_days(['2026-03-15', '15/03/2026', '20260315', None])
+
+    assert days.astype(str).tolist() == ['2026-03-15', 'NaT', '2026-03-15', 'NaT']
@@ -0,0 +1,110 @@
+"""
+Tests for the change log behind GET /api/changes
+"""
+
+import sqlite3
+
+import pytest
+
+import app as backend
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(backend, 'DATABASE_FILE', str(tmp_path / 'sports_evaluation.db'))
+    backend.init_database()
+    return backend.app.test_client()
+
+
+def get_changes(client, since=0):
+    response = client.get(f'/api/changes?since={since}')
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def entries_for(changes, entity, entity_id):
+    return [c for c in changes if c['entity'] == entity and c['entity_id'] == entity_id]
+
+
+def test_new_database_seeds_defaults(client):
+    changes = get_changes(client)['changes']
+
+    assert [c['entity'] for c in changes] == ['config'] + ['discipline'] * 4
+    assert all(c['op'] == 'upsert' for c in changes)
+
+
+def test_delete_is_recorded_as_tombstone(client):
+    team_id = client.post('/api/teams', json={'name': 'Equipo A'}).get_json()['id']
+    since = get_changes(client)['seq']
+    client.delete(f'/api/teams/{team_id}')
+
+    delta = get_changes(client, since)
+    assert delta['reset'] is False
+    assert delta['changes'] == [{
+        "seq": delta['seq'],
+        "entity": 'team',
+        "entity_id": team_id,
+        "op": 'delete',
+        "data": None
+    }]
+
+
+def test_deleting_team_removes_its_tests(client):
+    team_id = client.post('/api/teams', json={'name': 'Equipo A'}).get_json()['id']
+    test_id = client.post('/api/tests', json={
+        'team_id': team_id, 'discipline_id': 1, 'score': 8.5, 'test_date': '2026-01-01'
+    }).get_json()['id']
+    client.delete(f'/api/teams/{team_id}')
+
+    changes = get_changes(client)['changes']
+    assert [c['op'] for c in entries_for(changes, 'test', test_id)] == ['delete']
+    conn = sqlite3.connect(backend.DATABASE_FILE)
+    assert conn.execute('SELECT COUNT(*) FROM tests').fetchone()[0] == 0
+    conn.close()
+
+def test_latest_entry_replaces_older_ones(client):
+    discipline_id = client.post('/api/disciplines', json={'name': 'Cinta'}).get_json()['id']
+    first_seq = get_changes(client)['seq']
+    client.put(f'/api/disciplines/{discipline_id}', json={'name': 'Cuerda'})
+
+    delta = get_changes(client)
+    [entry] = entries_for(delta['changes'], 'discipline', discipline_id)
+    assert entry['seq'] > first_seq
+    assert entry['data']['name'] == 'Cuerda'
+    # Clients already past the first entry still receive the update
+    assert entries_for(get_changes(client, first_seq)['changes'], 'discipline', discipline_id) == [entry]
+
+
+def test_since_ahead_of_server_requests_reset(client):
+    latest = get_changes(client)['seq']
+
+    delta = get_changes(client, latest + 10)
+    assert delta == {"seq": latest, "reset": True, "changes": []}
+    assert client.get('/api/changes?since=-1').status_code == 400
+
+
+def test_existing_database_is_seeded_once(client):
+    conn = sqlite3.connect(backend.DATABASE_FILE)
+    conn.execute('DROP TABLE changes')
+    team_id = conn.execute("INSERT INTO teams (name) VALUES ('Equipo A')").lastrowid
+    test_id = conn.execute('''
+        INSERT INTO tests (team_id, discipline_id, score, test_date, lambda_value)
+        VALUES (?, 1, 8.5, '2026-01-01', 0.95)
+    ''', (team_id,)).lastrowid
+    # A test left behind by a deleted team is not synced
+    conn.execute('''
+        INSERT INTO tests (team_id, discipline_id, score, test_date, lambda_value)
+        VALUES (999, 1, 3.0, '2026-01-01', 0.95)
+    ''')
+    conn.commit()
+    conn.close()
+
+    backend.init_database()
+    changes = get_changes(client)['changes']
+    assert entries_for(changes, 'team', team_id)[0]['data']['name'] == 'Equipo A'
+    assert entries_for(changes, 'test', test_id)[0]['data']['score'] == 8.5
+    assert len([c for c in changes if c['entity'] == 'test']) == 1
+
+    # Seeding only happens while the log is empty
+    backend.init_database()
+    assert get_changes(client)['changes'] == changes
@@ -0,0 +1,69 @@
+"""
+Tests for JSON serialization and response compression
+"""
+
+import gzip
+import zlib
+from datetime import date, datetime
+
+import pytest
+
+import app as backend
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(backend, 'DATABASE_FILE', str(tmp_path / 'sports_evaluation.db'))
+    backend.init_database()
+    client = backend.app.test_client()
+    for i in range(40):
+        client.post('/api/teams', json={'name': f'Equipo {i}'})
+    return client
+
+
+def get_teams(client, encoding=None):
+    headers = {'Accept-Encoding': encoding} if encoding else {}
+    return client.get('/api/teams', headers=headers)
+
+
+def test_gzip_preferred_and_round_trips(client):
+    plain = get_teams(client)
+    response = get_teams(client, 'deflate;q=0.5, gzip')
+
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.vary
+    assert gzip.decompress(response.get_data()) == plain.get_data()
+
+
+def test_deflate_and_refused_encodings(client):
+    plain = get_teams(client).get_data()
+
+    response = get_teams(client, 'deflate')
+    assert response.headers['Content-Encoding'] == 'deflate'
+    assert zlib.decompress(response.get_data()) == plain
+
+    response = get_teams(client, 'gzip;q=0, deflate;q=0')
+    assert 'Content-Encoding' not in response.headers
+    assert response.get_data() == plain
+
+
+def test_small_responses_are_not_compressed(client, monkeypatch):
+    size = len(get_teams(client).get_data())
+    monkeypatch.setattr(backend, 'COMPRESS_MIN_SIZE', size + 1)
+
+    response = get_teams(client, 'gzip')
+    assert 'Content-Encoding' not in response.headers
+    assert 'Accept-Encoding' in response.vary
+
+
+@pytest.mark.skipif(backend.orjson is None, reason='orjson not installed')
+def test_orjson_output_matches_stdlib(monkeypatch):
+    payload = {
+        "z": [1, 2.5, None, True],
+        "a": {"day": date(2026, 3, 1), "at": datetime(2026, 3, 1, 12, 30)},
+        "name": "Equipo A"
+    }
+    # Same options as the compact response body
+    fast = backend.app.json.dumps_bytes(payload, separators=(",", ":"))
+    monkeypatch.setattr(backend, 'orjson', None)
+    assert backend.app.json.dumps_bytes(payload, separators=(",", ":")) == fast
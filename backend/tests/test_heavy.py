@@ -0,0 +1,83 @@
+"""
+Tests for request coalescing and load shedding on heavy endpoints
+"""
+
+import threading
+import time
+
+import pytest
+from flask import make_response
+
+import app as backend
+
+
+def test_concurrent_calls_share_one_result():
+    flight = backend.SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    calls, results = [], []
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return 'snapshot'
+
+    leader = threading.Thread(target=lambda: results.append(flight.do('key', compute)))
+    leader.start()
+    started.wait(5)
+    followers = [threading.Thread(target=lambda: results.append(flight.do('key', compute))) for _ in range(3)]
+    for thread in followers:
+        thread.start()
+    time.sleep(0.1)  # Let the followers reach do() while the leader is still running
+    release.set()
+    for thread in [leader] + followers:
+        thread.join(5)
+
+    assert results == ['snapshot'] * 4
+    assert len(calls) == 1
+    assert flight.do('key', lambda: 'next') == 'next'
+
+
+def test_errors_reach_every_caller_and_are_not_cached():
+    flight = backend.SingleFlight()
+
+    def fail():
+        raise ValueError('boom')
+
+    with pytest.raises(ValueError):
+        flight.do('key', fail)
+    assert flight.do('key', lambda: 42) == 42
+
+
+def call_heavy(view, path='/api/heavy?x=1'):
+    with backend.app.test_request_context(path):
+        return backend.heavy_endpoint(view)()
+
+
+def test_saturated_endpoint_returns_503(monkeypatch):
+    monkeypatch.setattr(backend, '_heavy_slots', threading.BoundedSemaphore(1))
+    monkeypatch.setattr(backend, 'HEAVY_QUEUE_TIMEOUT', 0.01)
+    backend._heavy_slots.acquire()
+
+    response = call_heavy(lambda: {"ok": True})
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == str(backend.HEAVY_RETRY_AFTER)
+    assert response.get_json() == {"error": "Server busy, retry later"}
+
+
+def test_response_headers_are_copied_except_per_request_ones():
+    def view():
+        response = make_response({"ok": True}, 201)
+        response.headers['X-Data-Version'] = '7'
+        response.set_cookie('session', 'secret')
+        return response
+
+    response = call_heavy(view)
+    assert response.status_code == 201
+    assert response.get_json() == {"ok": True}
+    assert response.headers['X-Data-Version'] == '7'
+    assert response.mimetype == 'application/json'
+    assert 'Set-Cookie' not in response.headers
+    # The slot is released once the view returns
+    assert backend._heavy_slots.acquire(blocking=False)
+    backend._heavy_slots.release()
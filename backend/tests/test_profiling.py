@@ -0,0 +1,54 @@
+"""
+Tests for access control on the on-demand profiling endpoints
+"""
+
+import pytest
+
+import app as backend
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(backend, 'PROFILING_ENABLED', True)
+    monkeypatch.setattr(backend, 'PROFILING_TOKEN', 's3cret')
+    monkeypatch.setattr(backend, 'PROFILING_DIR', str(tmp_path))
+    (tmp_path / 'req.collapsed').write_text('main (app.py:1) 3\n')
+    return backend.app.test_client()
+
+
+def get(client, path, token=None):
+    headers = {'X-Profile-Token': token} if token is not None else {}
+    return client.get(path, headers=headers)
+
+
+@pytest.mark.parametrize('setting, value', [('PROFILING_ENABLED', False), ('PROFILING_TOKEN', '')])
+def test_endpoints_hidden_when_disabled_or_without_token(client, monkeypatch, setting, value):
+    monkeypatch.setattr(backend, setting, value)
+
+    assert get(client, '/api/debug/profiles', 's3cret').status_code == 404
+    assert get(client, '/api/debug/profiles/req.collapsed', '').status_code == 404
+
+
+def test_wrong_or_missing_token_is_rejected(client):
+    assert get(client, '/api/debug/profiles').status_code == 403
+    assert get(client, '/api/debug/profiles', 's3cre').status_code == 403
+    assert get(client, '/api/debug/profiles/req.collapsed', 'wrong').status_code == 403
+
+
+def test_valid_token_grants_access(client):
+    assert get(client, '/api/debug/profiles', 's3cret').get_json() == []
+
+    response = get(client, '/api/debug/profiles/req.collapsed', 's3cret')
+    assert response.status_code == 200
+    assert response.get_data() == b'main (app.py:1) 3\n'
+
+
+def test_token_selects_request_for_profiling(client, monkeypatch):
+    monkeypatch.setattr(backend, 'PROFILING_SAMPLE_RATE', 0.0)
+
+    with backend.app.test_request_context('/api/teams', headers={'X-Profile-Token': 's3cret'}):
+        assert backend.should_profile()
+    with backend.app.test_request_context('/api/teams', headers={'X-Profile-Token': 'nope'}):
+        assert not backend.should_profile()
+    with backend.app.test_request_context('/api/debug/profiles', headers={'X-Profile-Token': 's3cret'}):
+        assert not backend.should_profile()
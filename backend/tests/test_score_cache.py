@@ -0,0 +1,86 @@
+"""
+Tests for the day-scoped score snapshot and its background refresh scheduling
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+import app as backend
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    calls = []
+
+    def build(today):
+        calls.append(today)
+        return {"rankings": [], "discipline_rankings": [], "evolution": {}}
+
+    monkeypatch.setattr(backend, 'build_score_snapshot', build)
+    score_cache = backend.ScoreCache(debounce=0.5)
+    score_cache.calls = calls
+    return score_cache
+
+
+def fail(today):
+    raise RuntimeError('database unavailable')
+
+
+def test_snapshot_is_reused_until_data_changes(cache):
+    first = cache.get()
+    assert cache.get() is first
+    assert len(cache.calls) == 1
+
+    backend.bump_data_version()
+    assert cache.get() is not first
+    assert len(cache.calls) == 2
+
+
+def test_snapshot_from_another_day_is_stale(cache):
+    snapshot = cache.get()
+    snapshot['day'] = (datetime.now() - timedelta(days=1)).date()
+
+    assert cache.status()['warm'] is False
+    assert cache.get() is not snapshot
+
+
+def test_failed_refresh_backs_off_exponentially(cache, monkeypatch):
+    monkeypatch.setattr(backend, 'build_score_snapshot', fail)
+    monkeypatch.setattr(backend.app.logger, 'disabled', True)
+
+    delays = []
+    for _ in range(3):
+        cache._step()
+        delays.append(cache._seconds_until_due())
+    assert delays[0] == pytest.approx(1.0, abs=0.1)
+    assert delays[1] == pytest.approx(2.0, abs=0.1)
+    assert delays[2] == pytest.approx(4.0, abs=0.1)
+
+
+def test_backoff_is_capped_without_overflow(cache):
+    cache._failures = 5000
+    cache._schedule_retry()
+
+    assert 0 < cache._seconds_until_due() <= backend.PRECOMPUTE_MAX_BACKOFF
+
+
+def test_fresh_snapshot_clears_past_retry(cache):
+    cache.get()
+    # A follower that saw a failed leader may schedule a retry after a later success
+    cache._failures = 3
+    cache._retry_at = 0.0
+
+    cache._step()
+    assert cache._retry_at is None
+    assert cache._seconds_until_due() > 1.0
+
+
+def test_write_waits_for_debounce(cache):
+    cache.get()
+    backend.bump_data_version()
+    cache.notify_write()
+
+    cache._step()
+    assert len(cache.calls) == 1
+    assert 0 < cache._seconds_until_due() <= 0.5
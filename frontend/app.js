@@ -6,8 +6,11 @@
 class SportsEvaluationSystem {
     constructor() {
         this.teams = new Map();
+        this.disciplines = [];
         this.lambda = 0.95;
         this.chart = null;
+        // Last change sequence applied from /api/changes
+        this.syncSeq = 0;
         // Use production API URL when deployed, localhost for development
         this.apiUrl = window.location.hostname === 'localhost'
             ? 'http://localhost:8000/api'
@@ -18,8 +21,11 @@ class SportsEvaluationSystem {
     }
 
     async init() {
+        this.loadFromLocalStorage();
         await this.loadConfiguration();
-        await this.loadTeamsFromAPI();
+        if (!await this.syncChanges()) {
+            await this.loadTeamsFromAPI();
+        }
         this.setupEventListeners();
         this.updateUI();
         this.setCurrentDate();
@@ -127,26 +133,30 @@ class SportsEvaluationSystem {
             const response = await fetch(`${this.apiUrl}/teams`);
             if (response.ok) {
                 const teams = await response.json();
-                this.teams.clear();
+                // Only replace the current teams once every team loaded
+                const loadedTeams = new Map();
                 
                 for (const team of teams) {
                     // Get team tests
                     const testsResponse = await fetch(`${this.apiUrl}/teams/${team.id}/tests`);
-                    if (testsResponse.ok) {
-                        const teamData = await testsResponse.json();
-                        this.teams.set(team.name, {
-                            id: team.id,
-                            name: team.name,
-                            tests: teamData.tests.map(test => ({
-                                score: test.score,
-                                date: test.test_date,
-                                lambda: test.lambda_value,
-                                timestamp: test.created_at
-                            })),
-                            createdAt: team.created_at
-                        });
+                    if (!testsResponse.ok) {
+                        throw new Error(`Failed to load tests for team ${team.name}`);
                     }
+                    const teamData = await testsResponse.json();
+                    loadedTeams.set(team.name, {
+                        id: team.id,
+                        name: team.name,
+                        tests: teamData.tests.map(test => ({
+                            id: test.id,
+                            score: test.score,
+                            date: test.test_date,
+                            lambda: test.lambda_value,
+                            timestamp: test.created_at
+                        })),
+                        createdAt: team.created_at
+                    });
                 }
+                this.teams = loadedTeams;
             }
         } catch (error) {
             console.error('Error loading teams:', error);
@@ -154,6 +164,110 @@ class SportsEvaluationSystem {
         }
     }
 
+    // Delta sync: fetch only the changes since the last applied sequence
+    async syncChanges() {
+        try {
+            let delta = await this.fetchChanges(this.syncSeq);
+
+            if (delta.reset) {
+                // The server no longer knows our sequence; rebuild from scratch
+                this.syncSeq = 0;
+                delta = await this.fetchChanges(0);
+            }
+
+            if (this.syncSeq === 0) {
+                // A sync from 0 carries the full state
+                this.teams.clear();
+                this.disciplines = [];
+            }
+
+            this.applyChanges(delta.changes);
+            this.syncSeq = delta.seq;
+            this.saveToLocalStorage();
+            return true;
+        } catch (error) {
+            if (error.retryAfter !== undefined) {
+                // Server is shedding load: keep the cached data and retry when asked to
+                this.showStatus('Servidor ocupado, se muestran los datos guardados', 'error');
+                setTimeout(async () => {
+                    if (await this.syncChanges()) this.updateUI();
+                }, error.retryAfter * 1000);
+                return true;
+            }
+            console.error('Error syncing changes:', error);
+            return false;
+        }
+    }
+
+    async fetchChanges(since) {
+        const response = await fetch(`${this.apiUrl}/changes?since=${since}`);
+        if (response.status === 503) {
+            const error = new Error('Server busy');
+            error.retryAfter = parseInt(response.headers.get('Retry-After'), 10) || 5;
+            throw error;
+        }
+        if (!response.ok) {
+            throw new Error('Failed to load changes');
+        }
+        return response.json();
+    }
+
+    applyChanges(changes) {
+        const teamsById = new Map();
+        this.teams.forEach(team => teamsById.set(team.id, team));
+        const touchedTeams = new Set();
+
+        for (const change of changes) {
+            const data = change.data;
+
+            if (change.entity === 'config' && data) {
+                this.lambda = data.global_lambda;
+                document.getElementById('lambdaGlobal').value = this.lambda;
+                document.getElementById('lambdaValue').textContent = this.lambda;
+            } else if (change.entity === 'discipline') {
+                this.disciplines = this.disciplines.filter(d => d.id !== change.entity_id);
+                if (data) this.disciplines.push(data);
+            } else if (change.entity === 'team') {
+                const existing = teamsById.get(change.entity_id);
+                if (existing) {
+                    this.teams.delete(existing.name);
+                    teamsById.delete(change.entity_id);
+                }
+                if (data) {
+                    const team = {
+                        id: data.id,
+                        name: data.name,
+                        tests: existing ? existing.tests : [],
+                        createdAt: data.created_at
+                    };
+                    this.teams.set(team.name, team);
+                    teamsById.set(team.id, team);
+                }
+            } else if (change.entity === 'test') {
+                // Tests never move between teams, but a tombstone does not say which team it was in
+                const owners = data ? [teamsById.get(data.team_id)] : Array.from(teamsById.values());
+                for (const team of owners) {
+                    if (!team) continue;
+                    team.tests = team.tests.filter(test => test.id !== change.entity_id);
+                    touchedTeams.add(team);
+                }
+                const team = data && teamsById.get(data.team_id);
+                if (team) {
+                    team.tests.push({
+                        id: data.id,
+                        score: data.score,
+                        date: data.test_date,
+                        lambda: data.lambda_value,
+                        timestamp: data.created_at,
+                        discipline_id: data.discipline_id
+                    });
+                }
+            }
+        }
+
+        touchedTeams.forEach(team => team.tests.sort((a, b) => new Date(a.date) - new Date(b.date)));
+    }
+
     async addTeam(name) {
         if (!name || name.trim() === '') {
             alert('Por favor ingresa un nombre válido para el equipo.');
@@ -185,6 +299,7 @@ class SportsEvaluationSystem {
                     tests: [],
                     createdAt: team.created_at
                 });
+                await this.syncChanges();
 
                 this.updateUI();
                 this.showStatus('Equipo agregado correctamente', 'success');
@@ -219,6 +334,7 @@ class SportsEvaluationSystem {
 
             if (response.ok) {
                 this.teams.delete(teamName);
+                await this.syncChanges();
                 this.updateUI();
                 this.showStatus('Equipo eliminado', 'success');
             } else {
@@ -273,6 +389,7 @@ class SportsEvaluationSystem {
                 
                 // Update local data
                 const localTest = {
+                    id: test.id,
                     score: test.score,
                     date: test.test_date,
                     lambda: test.lambda_value,
@@ -282,6 +399,7 @@ class SportsEvaluationSystem {
 
                 team.tests.push(localTest);
                 team.tests.sort((a, b) => new Date(a.date) - new Date(b.date));
+                await this.syncChanges();
 
                 this.updateUI();
                 this.showStatus('Puntaje agregado correctamente', 'success');
@@ -471,6 +589,7 @@ class SportsEvaluationSystem {
             if (response.ok) {
                 const discipline = await response.json();
                 this.disciplines.push(discipline);
+                await this.syncChanges();
                 this.updateDisciplineSelector();
                 this.renderDisciplinesList();
                 this.showStatus('Disciplina agregada correctamente', 'success');
@@ -505,6 +624,7 @@ class SportsEvaluationSystem {
 
             if (response.ok) {
                 this.disciplines = this.disciplines.filter(d => d.id !== discipline.id);
+                await this.syncChanges();
                 this.updateDisciplineSelector();
                 this.renderDisciplinesList();
                 this.showStatus('Disciplina eliminada', 'success');
@@ -840,7 +960,9 @@ class SportsEvaluationSystem {
         try {
             const data = {
                 teams: Array.from(this.teams.entries()),
+                disciplines: this.disciplines,
                 lambda: this.lambda,
+                syncSeq: this.syncSeq,
                 lastModified: new Date().toISOString()
             };
             localStorage.setItem('sportsEvaluation', JSON.stringify(data));
@@ -856,7 +978,9 @@ class SportsEvaluationSystem {
             if (saved) {
                 const data = JSON.parse(saved);
                 this.teams = new Map(data.teams);
+                this.disciplines = data.disciplines || [];
                 this.lambda = data.lambda || 0.95;
+                this.syncSeq = data.syncSeq || 0;
                 
                 // Update lambda slider
                 document.getElementById('lambdaGlobal').value = this.lambda;
@@ -909,6 +1033,8 @@ class SportsEvaluationSystem {
                 if (data.teams && Array.isArray(data.teams)) {
                     this.teams = new Map(data.teams);
                     this.lambda = data.lambda || 0.95;
+                    // Imported data did not come from the change log; rebuild from the server on next sync
+                    this.syncSeq = 0;
                     
                     // Update UI
                     document.getElementById('lambdaGlobal').value = this.lambda;